@@ -1,6 +1,18 @@
 # Cargar bibliotecas requeridas
 import os
+import io
+import math
+import shutil
+import hashlib
+import tempfile
+import sys
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import geopandas as gpd
 import pandas as pd
 import numpy as np
@@ -8,16 +20,105 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import folium
+import branca.colormap as cm
+import shapely
+from jinja2 import Template
 from folium.plugins import MeasureControl
 from streamlit_folium import st_folium
 from shapely.geometry import Point
+from scipy.spatial import cKDTree
 from haversine import haversine, Unit
 import requests
 import json
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Solucionar el problema de memory leak 
 os.environ['OMP_NUM_THREADS'] = '1'
 
+# Archivos de datos de la aplicación
+RUTA_CANTONES = 'datos/cantones.gpkg'
+RUTA_CENTROS_EDUCATIVOS = 'datos/centros_educativos.csv'
+RUTA_POBLACION_VIVIENDA = 'datos/poblacion_vivienda_canton.csv'
+
+# Columnas utilizadas de cada fuente. CODPRES, ESTADO y CORREO no se cargan.
+COLUMNAS_CANTONES = ['PROVINCIA', 'CANTÓN']
+TIPOS_CENTROS_EDUCATIVOS = {
+    'CODSABER': str,
+    'CENTRO_EDU': str,
+    'TIPO_INSTI': str,
+    'REGIONAL': str,
+    'CIRCUITO': str,
+    'PROVINCIA': str,
+    'CANTON': str,
+    'DISTRITO': str,
+    'POBLADO': str,
+    'DIRECCION': str,
+    'LATITUD': 'float64',
+    'LONGITUD': 'float64'
+}
+TIPOS_POBLACION_VIVIENDA = {
+    'CANTÓN': str,
+    'POBLACION TOTAL': 'int64'
+}
+
+# Cantidad de vecinos más cercanos precalculados por centro educativo y tipo de institución
+K_VECINOS = 5
+
+# Columnas de la tabla de centros educativos y sus títulos
+COLUMNAS_TABLA = {
+    'CODSABER': "Código Saber",
+    'CENTRO_EDU': "Centro Educativo",
+    'TIPO_INSTI': "Tipo de Institución",
+    'REGIONAL': "Regional",
+    'CIRCUITO': "Circuito",
+    'PROVINCIA': "Provincia",
+    'CANTON': "Cantón",
+    'DISTRITO': "Distrito",
+    'POBLADO': "Poblado",
+    'DIRECCION': "Dirección"
+}
+TAMANOS_PAGINA_TABLA = [15, 25, 50, 100]
+
+# Presupuesto de memoria compartido por el estado de búsqueda de todas las sesiones
+PRESUPUESTO_BYTES_BUSQUEDA = 16 * 1024 * 1024
+
+# Directorio servido por Streamlit como archivos estáticos (server.enableStaticServing)
+DIRECTORIO_ESTATICO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIRECTORIO_EXPORTACIONES = os.path.join(DIRECTORIO_ESTATICO, 'exportaciones')
+
+DIRECTORIO_TESELAS = os.path.join(DIRECTORIO_ESTATICO, 'teselas', 'cantones')
+
+# Niveles de zoom con teselas precalculadas; en niveles mayores se reutilizan las del zoom máximo
+ZOOM_MINIMO_TESELAS = 6
+ZOOM_MAXIMO_TESELAS = 11
+
+# Precisión en grados de las coordenadas escritas en las teselas
+PRECISION_TESELAS = 1e-6
+
+# Cantidad de filas por bloque al generar las exportaciones
+TAMANO_BLOQUE_EXPORTACION = 1000
+
+# Streamlit no sirve archivos estáticos de más de 200 MB y desactiva el directorio
+# estático completo si supera 1 GB, por lo que las exportaciones guardadas tienen un tope
+MAXIMO_BYTES_ARCHIVO_ESTATICO = 200 * 1024 * 1024
+MAXIMO_BYTES_EXPORTACIONES = 512 * 1024 * 1024
+
+COLUMNAS_EXPORTACION_CENTROS = [
+    'CODSABER', 'CENTRO_EDU', 'TIPO_INSTI', 'REGIONAL', 'CIRCUITO', 'PROVINCIA',
+    'CANTON', 'DISTRITO', 'POBLADO', 'DIRECCION', 'LATITUD', 'LONGITUD'
+]
+COLUMNAS_EXPORTACION_CANTONES = [
+    'PROVINCIA', 'CANTÓN', 'POBLACION TOTAL', 'TOTAL_CENTROS_EDUCATIVOS',
+    'TOTAL_CENTROS_EDUCATIVOS_PUBLICOS', 'TOTAL_CENTROS_EDUCATIVOS_PRIVADO', 'AREA_KM2',
+    'DENSIDAD_CENTROS_EDUCATIVOS_KM2', 'DENSIDAD_POBLACIONAL_KM2', 'CENTROS_EDUCATIVOS_10K_HABITANTES'
+]
+FORMATOS_EXPORTACION = {
+    'CSV': 'csv',
+    'GeoJSON (una entidad por línea)': 'geojsonl',
+    'GeoParquet': 'parquet'
+}
+
 # Configuración de pandas
 pd.set_option('display.float_format', '{:,.2f}'.format)
 
@@ -41,33 +142,65 @@ def calcular_distancia(latitud1, longitud1, latitud2, longitud2):
     punto2 = (latitud2, longitud2)
     return haversine(punto1, punto2, unit=Unit.KILOMETERS)
 
-@st.cache_data
-def simplificar_geometrias(_geodataframe, tolerancia=0.001):
-    """
-        Simplifica las geometrías del GeoDataFrame para mejorar el rendimiento.
-        Tolerancia de 0.001° (aproximadamente 100 metros).
-    """
-    geodataframe_simplificado = _geodataframe.copy()
-    geodataframe_simplificado['geometry'] = geodataframe_simplificado['geometry'].simplify(
-        tolerance=tolerancia, 
-        preserve_topology=True
+def medir_carga(funcion, *args, **kwargs):
+    """Ejecutar una función de lectura y devolver su resultado junto con la duración en segundos"""
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+def leer_cantones(motor_geopackage='pyogrio'):
+    """Leer las geometrías de los cantones con las columnas utilizadas"""
+    opciones = {'use_arrow': True} if motor_geopackage == 'pyogrio' else {}
+    return gpd.read_file(RUTA_CANTONES, engine=motor_geopackage, columns=COLUMNAS_CANTONES, **opciones)
+
+def leer_centros_educativos(motor_csv='pyarrow'):
+    """Leer los centros educativos con las columnas y tipos declarados"""
+    return pd.read_csv(
+        RUTA_CENTROS_EDUCATIVOS,
+        engine=motor_csv,
+        encoding='utf-8',
+        usecols=list(TIPOS_CENTROS_EDUCATIVOS),
+        dtype=TIPOS_CENTROS_EDUCATIVOS
+    )
+
+def leer_poblacion_vivienda(motor_csv='pyarrow'):
+    """Leer la población por cantón con las columnas y tipos declarados"""
+    return pd.read_csv(
+        RUTA_POBLACION_VIVIENDA,
+        engine=motor_csv,
+        encoding='latin-1',
+        usecols=list(TIPOS_POBLACION_VIVIENDA),
+        dtype=TIPOS_POBLACION_VIVIENDA
     )
-    return geodataframe_simplificado
 
-@st.cache_data
-def cargar_datos():
-    """Función para cargar datos con caché"""
+@st.cache_resource
+def cargar_datos(motor_csv='pyarrow', motor_geopackage='pyogrio'):
+    """
+        Función para cargar datos con caché.
+        Las tres fuentes se leen de forma concurrente y se registra el tiempo de carga de cada una.
+        El resultado se comparte entre todas las sesiones y no debe modificarse.
+    """
 
     try:
-        cantones_gdf = gpd.read_file('datos/cantones.gpkg')
-        centro_educativos_df = pd.read_csv('datos/centros_educativos.csv')
-        poblacion_vivienda_canton_df = pd.read_csv('datos/poblacion_vivienda_canton.csv', encoding='latin-1')
+        tiempos_carga = {}
+
+        with ThreadPoolExecutor(max_workers=3) as ejecutor:
+            futuro_cantones = ejecutor.submit(medir_carga, leer_cantones, motor_geopackage)
+            futuro_centros = ejecutor.submit(medir_carga, leer_centros_educativos, motor_csv)
+            futuro_poblacion = ejecutor.submit(medir_carga, leer_poblacion_vivienda, motor_csv)
+
+            cantones_gdf, tiempos_carga['Cantones (GeoPackage)'] = futuro_cantones.result()
+            centro_educativos_df, tiempos_carga['Centros educativos (CSV)'] = futuro_centros.result()
+            poblacion_vivienda_canton_df, tiempos_carga['Población y vivienda (CSV)'] = futuro_poblacion.result()
+
+        inicio_procesamiento = time.perf_counter()
         
         centro_educativos_gdf = gpd.GeoDataFrame(
             centro_educativos_df, 
             geometry=gpd.points_from_xy(centro_educativos_df.LONGITUD, centro_educativos_df.LATITUD),
             crs='EPSG:4326'
         )
+        centro_educativos_gdf['PROVINCIA'] = centro_educativos_gdf['PROVINCIA'].fillna('').astype(str)
         
         # Operaciones espaciales entre cantones y centros educativos
         total_centro_educativos = gpd.sjoin(centro_educativos_gdf, cantones_gdf, how='left', predicate='within')
@@ -90,11 +223,11 @@ def cargar_datos():
         cantones_centros_educativos_gdf = cantones_centros_educativos_gdf.merge(total_centro_educativos_publicos, on='CANTÓN', how='left')
         cantones_centros_educativos_gdf = cantones_centros_educativos_gdf.merge(total_centro_educativos_privados, on='CANTÓN', how='left')
         
-        poblacion_vivienda_canton_df = poblacion_vivienda_canton_df.drop(columns=['PROVINCIA'])
         cantones_centros_educativos_gdf = cantones_centros_educativos_gdf.merge(poblacion_vivienda_canton_df, on='CANTÓN', how='left')
 
         # Cálculos de área y densidad
         cantones_centros_educativos_crtm05_gdf = cantones_centros_educativos_gdf.to_crs(epsg=5367)
+        cantones_centros_educativos_crtm05_gdf['PROVINCIA'] = cantones_centros_educativos_crtm05_gdf['PROVINCIA'].fillna('').astype(str)
         cantones_centros_educativos_crtm05_gdf['AREA_M2'] = cantones_centros_educativos_crtm05_gdf.geometry.area
         cantones_centros_educativos_crtm05_gdf['AREA_KM2'] = cantones_centros_educativos_crtm05_gdf['AREA_M2'] / 1000000
         cantones_centros_educativos_crtm05_gdf['DENSIDAD_CENTROS_EDUCATIVOS_KM2'] = (
@@ -108,11 +241,383 @@ def cargar_datos():
             cantones_centros_educativos_crtm05_gdf['POBLACION TOTAL']
         ) * 10000
 
-        return cantones_centros_educativos_crtm05_gdf, centro_educativos_gdf
+        tiempos_carga['Procesamiento espacial'] = time.perf_counter() - inicio_procesamiento
+
+        return cantones_centros_educativos_crtm05_gdf, centro_educativos_gdf, tiempos_carga
         
     except Exception as e:
         st.error(f"Ha ocurrido un error al cargar los datos: {e}")
-        return None, None
+        return None, None, {}
+
+@st.cache_resource
+def construir_vecinos_cercanos(_centros_gdf, k=K_VECINOS):
+    """
+        Tabla con los k centros educativos públicos y privados más cercanos a cada centro.
+        Se construye una única vez con un árbol KD sobre las coordenadas en CRTM05 (metros).
+        Para cada tipo devuelve las posiciones de fila (-1 si no existen) y las distancias en km.
+    """
+    puntos = _centros_gdf.geometry.to_crs(epsg=5367)
+    coordenadas = np.column_stack([puntos.x.to_numpy(), puntos.y.to_numpy()])
+    validos = np.isfinite(coordenadas).all(axis=1)
+    tipos = _centros_gdf['TIPO_INSTI'].to_numpy()
+    consultas = np.flatnonzero(validos)
+
+    vecinos = {}
+    for tipo in ['PÚBLICO', 'PRIVADO']:
+        indices = np.full((len(_centros_gdf), k), -1, dtype=np.int32)
+        distancias = np.full((len(_centros_gdf), k), np.inf, dtype=np.float32)
+        posiciones_tipo = np.flatnonzero(validos & (tipos == tipo))
+
+        if len(posiciones_tipo) > 0:
+            arbol = cKDTree(coordenadas[posiciones_tipo])
+
+            # Consultar un vecino adicional para poder excluir al propio centro
+            distancias_arbol, indices_arbol = arbol.query(coordenadas[consultas], k=k + 1)
+            encontrados = indices_arbol < len(posiciones_tipo)
+            candidatos = np.where(encontrados, posiciones_tipo[np.minimum(indices_arbol, len(posiciones_tipo) - 1)], -1)
+
+            # Mover al propio centro al final de cada fila y conservar los k primeros
+            orden = np.argsort(candidatos == consultas[:, None], axis=1, kind='stable')
+            indices[consultas] = np.take_along_axis(candidatos, orden, axis=1)[:, :k]
+            distancias[consultas] = np.take_along_axis(distancias_arbol, orden, axis=1)[:, :k] / 1000
+
+        vecinos[tipo] = (indices, distancias)
+
+    return vecinos
+
+@st.cache_resource
+def construir_indice_nombres(_centros_gdf):
+    """Lista ordenada de nombres de centros educativos y posición de fila de cada nombre"""
+    nombres = _centros_gdf['CENTRO_EDU']
+    posiciones = {nombre: posicion for posicion, nombre in reversed(list(enumerate(nombres))) if isinstance(nombre, str)}
+    return sorted(posiciones), posiciones
+
+@st.cache_resource
+def construir_indice_tabla(_centros_gdf):
+    """
+        Permutaciones de orden ascendente de cada columna de la tabla.
+        Se calculan una vez sobre el conjunto de datos compartido.
+    """
+    permutaciones = {}
+    for columna in COLUMNAS_TABLA:
+        valores = _centros_gdf[columna].fillna('').astype(str).to_numpy(dtype=object)
+        permutaciones[columna] = np.argsort(valores, kind='stable').astype(np.int32)
+    return permutaciones
+
+@st.cache_resource
+def obtener_textos_tabla(_centros_gdf, columna):
+    """Textos en minúsculas de una columna de la tabla, calculados la primera vez que se filtra por ella"""
+    valores = _centros_gdf[columna].fillna('').astype(str).to_numpy(dtype=object)
+    return np.array([valor.lower() for valor in valores], dtype=object)
+
+@st.cache_resource(max_entries=32)
+def calcular_orden_tabla(_centros_gdf, _centros_filtrados, provincia, tipo_institucion, columna_orden, ascendente, columna_filtro, texto_filtro):
+    """
+        Posiciones de fila de los centros filtrados en el orden solicitado.
+        El texto del filtro llega normalizado para que el resultado se reutilice
+        entre sesiones y al cambiar de página.
+    """
+
+    mascara = np.zeros(len(_centros_gdf), dtype=bool)
+    mascara[_centros_gdf.index.get_indexer(_centros_filtrados.index)] = True
+
+    # Filtro de texto sobre la columna seleccionada
+    if texto_filtro:
+        textos = obtener_textos_tabla(_centros_gdf, columna_filtro)
+        mascara &= np.fromiter((texto_filtro in texto for texto in textos), dtype=bool, count=len(textos))
+
+    orden = construir_indice_tabla(_centros_gdf)[columna_orden]
+    if not ascendente:
+        orden = orden[::-1]
+    return orden[mascara[orden]]
+
+def obtener_vecinos_cercanos(centros_gdf, vecinos, posicion):
+    """Centros educativos más cercanos del mismo tipo y del otro tipo a partir de la tabla precalculada"""
+    tipo = centros_gdf['TIPO_INSTI'].iat[posicion]
+    otro_tipo = 'PRIVADO' if tipo == 'PÚBLICO' else 'PÚBLICO'
+
+    tablas = []
+    for tipo_vecino, relacion in [(tipo, 'Mismo tipo'), (otro_tipo, 'Otro tipo')]:
+        if tipo_vecino not in vecinos:
+            continue
+        indices, distancias = vecinos[tipo_vecino]
+        existentes = indices[posicion] >= 0
+        tablas.append(
+            centros_gdf.iloc[indices[posicion][existentes]].assign(
+                DISTANCIA_KM=distancias[posicion][existentes].astype(float),
+                RELACION=relacion
+            )
+        )
+    return pd.concat(tablas)
+
+# ============================================================================
+# Teselas de cantones para las capas de coropletas
+# ============================================================================
+
+def limites_tesela(z, x, y):
+    """Límites (oeste, sur, este, norte) en grados de una tesela web mercator"""
+    n = 2 ** z
+    oeste = x / n * 360 - 180
+    este = (x + 1) / n * 360 - 180
+    norte = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    sur = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return oeste, sur, este, norte
+
+def tesela_de_punto(lon, lat, z):
+    """Coordenadas (x, y) de la tesela que contiene un punto en el nivel de zoom indicado"""
+    n = 2 ** z
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def propiedades_cantones(cantones_gdf):
+    """Métricas redondeadas de cada cantón que se adjuntan a las entidades de las teselas"""
+    propiedades = pd.DataFrame({
+        'CANTÓN': cantones_gdf['CANTÓN'],
+        'PROVINCIA': cantones_gdf['PROVINCIA'],
+        'Total Centros': cantones_gdf['TOTAL_CENTROS_EDUCATIVOS'].fillna(0).astype(int),
+        'Centros Públicos': cantones_gdf['TOTAL_CENTROS_EDUCATIVOS_PUBLICOS'].fillna(0).astype(int),
+        'Centros Privados': cantones_gdf['TOTAL_CENTROS_EDUCATIVOS_PRIVADO'].fillna(0).astype(int),
+        'Densidad (centros/km²)': cantones_gdf['DENSIDAD_CENTROS_EDUCATIVOS_KM2'].round(4),
+        'Centros por 10k hab': cantones_gdf['CENTROS_EDUCATIVOS_10K_HABITANTES'].round(2)
+    })
+    propiedades = propiedades.astype(object).where(propiedades.notna(), None)
+    return propiedades.to_dict(orient='records')
+
+def escribir_tesela(ruta, entidades):
+    """Escribir una tesela como FeatureCollection a partir de entidades ya serializadas"""
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write('{"type":"FeatureCollection","features":[' + ','.join(entidades) + ']}')
+
+@st.cache_resource
+def generar_teselas_cantones(_cantones_gdf):
+    """
+        Genera una única vez las teselas GeoJSON de los cantones para cada nivel de zoom.
+        Las geometrías se simplifican al tamaño de un píxel y se recortan a cada tesela,
+        por lo que el tamaño de cada tesela no depende de la complejidad de los polígonos.
+        Los bordes se incluyen como líneas aparte para que los recortes no se dibujen.
+    """
+    cantones = _cantones_gdf.to_crs(epsg=4326)
+    propiedades = propiedades_cantones(cantones)
+    propiedades_json = [json.dumps(p, ensure_ascii=False, default=serializar_valor_json) for p in propiedades]
+    limites_json = [json.dumps({'CANTÓN': p['CANTÓN'], 'limite': True}, ensure_ascii=False) for p in propiedades]
+
+    # La versión cambia con los datos y con la configuración de generación de las teselas
+    configuracion = '|'.join([
+        obtener_version_datos(),
+        f"{ZOOM_MINIMO_TESELAS}-{ZOOM_MAXIMO_TESELAS}",
+        str(PRECISION_TESELAS),
+        ','.join(propiedades[0]) if propiedades else ''
+    ])
+    version = hashlib.sha1(configuracion.encode('utf-8')).hexdigest()[:12]
+    directorio = os.path.join(DIRECTORIO_TESELAS, version)
+    oeste, sur, este, norte = cantones.total_bounds
+
+    metadatos = {
+        'url': url_estatica(f"teselas/cantones/{version}/{{z}}/{{x}}/{{y}}.json"),
+        'zoom_minimo': ZOOM_MINIMO_TESELAS,
+        'zoom_maximo': ZOOM_MAXIMO_TESELAS,
+        'limites': [[float(sur), float(oeste)], [float(norte), float(este)]]
+    }
+
+    # Reutilizar las teselas generadas previamente para la misma versión de los datos
+    if os.path.exists(os.path.join(directorio, 'completo')):
+        return metadatos
+
+    # Eliminar las teselas de versiones anteriores de los datos
+    if os.path.isdir(DIRECTORIO_TESELAS):
+        for anterior in os.listdir(DIRECTORIO_TESELAS):
+            shutil.rmtree(os.path.join(DIRECTORIO_TESELAS, anterior), ignore_errors=True)
+
+    for z in range(ZOOM_MINIMO_TESELAS, ZOOM_MAXIMO_TESELAS + 1):
+        # Tolerancia de simplificación equivalente a un píxel de una tesela de 256 px
+        tamano_pixel = 360 / 2 ** z / 256
+        geometrias = cantones.geometry.simplify(tolerance=tamano_pixel, preserve_topology=True)
+        bordes = geometrias.boundary.to_numpy()
+        indice_espacial = geometrias.sindex
+        geometrias = geometrias.to_numpy()
+
+        x_inicio, y_inicio = tesela_de_punto(oeste, norte, z)
+        x_fin, y_fin = tesela_de_punto(este, sur, z)
+
+        for x in range(x_inicio, x_fin + 1):
+            for y in range(y_inicio, y_fin + 1):
+                t_oeste, t_sur, t_este, t_norte = limites_tesela(z, x, y)
+
+                posiciones = indice_espacial.query(shapely.box(t_oeste, t_sur, t_este, t_norte), predicate='intersects')
+                if len(posiciones) == 0:
+                    continue
+
+                # Polígonos y bordes se recortan exactamente a la tesela para que ninguna zona se pinte dos veces
+                poligonos = shapely.set_precision(
+                    shapely.clip_by_rect(geometrias[posiciones], t_oeste, t_sur, t_este, t_norte), PRECISION_TESELAS, mode='pointwise'
+                )
+                lineas = shapely.set_precision(
+                    shapely.clip_by_rect(bordes[posiciones], t_oeste, t_sur, t_este, t_norte), PRECISION_TESELAS, mode='pointwise'
+                )
+
+                entidades = []
+                for posicion, poligono, linea in zip(posiciones, poligonos, lineas):
+                    if not shapely.is_empty(poligono):
+                        entidades.append(f'{{"type":"Feature","geometry":{shapely.to_geojson(poligono)},"properties":{propiedades_json[posicion]}}}')
+                    if not shapely.is_empty(linea):
+                        entidades.append(f'{{"type":"Feature","geometry":{shapely.to_geojson(linea)},"properties":{limites_json[posicion]}}}')
+
+                if entidades:
+                    escribir_tesela(os.path.join(directorio, str(z), str(x), f"{y}.json"), entidades)
+
+    with open(os.path.join(directorio, 'completo'), 'w', encoding='utf-8') as archivo:
+        archivo.write(version)
+
+    return metadatos
+
+class CapaTeselasCantones(folium.map.Layer):
+    """
+        Capa de coropletas de cantones cargada desde las teselas GeoJSON y coloreada en el navegador.
+        Las capas del mismo mapa comparten la descarga de cada tesela.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.gridLayer({
+                minNativeZoom: {{ this.teselas.zoom_minimo }},
+                maxNativeZoom: {{ this.teselas.zoom_maximo }},
+                bounds: L.latLngBounds({{ this.teselas.limites|tojson }}),
+                noWrap: true,
+                updateWhenZooming: false
+            });
+
+            (function (capa) {
+                var url = {{ this.teselas.url|tojson }};
+                var metrica = {{ this.metrica|tojson }};
+                var umbrales = {{ this.umbrales|tojson }};
+                var colores = {{ this.colores|tojson }};
+                var cantones = {{ this.cantones|tojson }};
+                var campos = {{ this.campos|tojson }};
+                var grupo = L.layerGroup();
+                var activas = {};
+                window.teselasCantones = window.teselasCantones || {};
+
+                function color(valor) {
+                    for (var i = 0; i < umbrales.length; i++) {
+                        if (valor <= umbrales[i]) { return colores[i]; }
+                    }
+                    return colores[colores.length - 1];
+                }
+
+                function estilo(entidad) {
+                    if (entidad.properties.limite) {
+                        return {color: 'gray', weight: 1, fill: false};
+                    }
+                    var valor = entidad.properties[metrica];
+                    return {
+                        stroke: false,
+                        fillColor: valor === null ? '#ffffff' : color(valor),
+                        fillOpacity: valor === null ? 0 : 0.85
+                    };
+                }
+
+                function resaltar(canton, opacidad) {
+                    grupo.eachLayer(function (geojson) {
+                        geojson.eachLayer(function (elemento) {
+                            var propiedades = elemento.feature.properties;
+                            if (!propiedades.limite && propiedades['CANTÓN'] === canton && propiedades[metrica] !== null) {
+                                elemento.setStyle({fillOpacity: opacidad});
+                            }
+                        });
+                    });
+                }
+
+                function contenido(propiedades) {
+                    return campos.map(function (campo) {
+                        return '<b>' + campo + '</b>: ' + propiedades[campo];
+                    }).join('<br>');
+                }
+
+                function cargar(direccion) {
+                    if (!(direccion in window.teselasCantones)) {
+                        window.teselasCantones[direccion] = fetch(direccion)
+                            .then(function (respuesta) { return respuesta.ok ? respuesta.json() : {type: 'FeatureCollection', features: []}; })
+                            .catch(function () { return {type: 'FeatureCollection', features: []}; });
+                    }
+                    return window.teselasCantones[direccion];
+                }
+
+                capa.createTile = function (coords, done) {
+                    var tesela = document.createElement('div');
+                    var clave = coords.x + ':' + coords.y + ':' + coords.z;
+                    var marca = {};
+                    activas[clave] = marca;
+
+                    cargar(L.Util.template(url, coords)).then(function (datos) {
+                        if (activas[clave] === marca) {
+                            marca.geojson = L.geoJSON(datos, {
+                                filter: function (entidad) {
+                                    return cantones === null || cantones.indexOf(entidad.properties['CANTÓN']) >= 0;
+                                },
+                                style: estilo,
+                                onEachFeature: function (entidad, elemento) {
+                                    if (entidad.properties.limite) { return; }
+                                    elemento.bindTooltip(contenido(entidad.properties), {sticky: true});
+                                    elemento.bindPopup(contenido(entidad.properties));
+                                    elemento.on('mouseover', function () { resaltar(entidad.properties['CANTÓN'], 1); });
+                                    elemento.on('mouseout', function () { resaltar(entidad.properties['CANTÓN'], 0.85); });
+                                }
+                            });
+                            grupo.addLayer(marca.geojson);
+                        }
+                        done(null, tesela);
+                    });
+                    return tesela;
+                };
+
+                capa.on('tileunload', function (evento) {
+                    var clave = evento.coords.x + ':' + evento.coords.y + ':' + evento.coords.z;
+                    if (activas[clave] && activas[clave].geojson) {
+                        grupo.removeLayer(activas[clave].geojson);
+                    }
+                    delete activas[clave];
+                });
+                capa.on('add', function () { grupo.addTo(capa._map); });
+                capa.on('remove', function () { grupo.remove(); });
+            })({{ this.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, teselas, metrica, umbrales, colores, cantones, campos, name=None, show=True):
+        super().__init__(name=name, overlay=True, control=True, show=show)
+        self._name = 'CapaTeselasCantones'
+        self.teselas = teselas
+        self.metrica = metrica
+        self.umbrales = umbrales
+        self.colores = colores
+        self.cantones = cantones
+        self.campos = campos
+
+def agregar_capa_coropletas(m, teselas, cantones_gdf, columna, metrica, paleta, leyenda, nombre):
+    """Agregar al mapa una capa de coropletas por teselas con su leyenda de colores"""
+
+    valores = cantones_gdf[columna].to_numpy(dtype=float)
+    valores = valores[np.isfinite(valores)]
+    minimo, maximo = (valores.min(), valores.max()) if len(valores) > 0 else (0.0, 0.0)
+
+    # Escala de 9 clases de igual amplitud, equivalente a la leyenda de GeoDataFrame.explore
+    escala = paleta.scale(minimo, maximo)
+    indice = np.linspace(minimo, maximo, 10).tolist()
+    colores = [escala.rgb_hex_str((inferior + superior) / 2) for inferior, superior in zip(indice[:-1], indice[1:])]
+    cm.StepColormap(colores, index=indice, vmin=minimo, vmax=maximo, caption=leyenda).add_to(m)
+
+    CapaTeselasCantones(
+        teselas,
+        metrica,
+        indice[1:],
+        colores,
+        cantones_gdf['CANTÓN'].tolist(),
+        ['CANTÓN', 'PROVINCIA', 'Total Centros', 'Centros Públicos', 'Centros Privados', metrica],
+        name=nombre,
+        show=False
+    ).add_to(m)
 
 # ============================================================================
 # Funciones para la creacion de tablas, gráficos y mapas
@@ -133,20 +638,72 @@ def crear_tabla(centros_educativos, provincia):
             width='stretch',
             height=500,
             hide_index=True,
-            column_config={
-                'CODSABER': st.column_config.TextColumn("Código Saber"),
-                'CENTRO_EDU': st.column_config.TextColumn("Centro Educativo"),
-                'TIPO_INSTI': st.column_config.TextColumn("Tipo de Institución"),
-                'REGIONAL': st.column_config.TextColumn("Regional"),
-                'CIRCUITO': st.column_config.TextColumn("Circuito"),
-                'PROVINCIA': st.column_config.TextColumn("Provincia"),
-                'CANTON': st.column_config.TextColumn("Cantón"),
-                'DISTRITO': st.column_config.TextColumn("Distrito"),
-                'POBLADO': st.column_config.TextColumn("Poblado"),
-                'DIRECCION': st.column_config.TextColumn("Dirección")
-            }
+            column_config={columna: st.column_config.TextColumn(titulo) for columna, titulo in COLUMNAS_TABLA.items()}
         )
 
+def crear_tabla_paginada(centros_gdf, centros_educativos, provincia, tipo_institucion):
+    """Tabla de Centros Educativos paginada, ordenada y filtrada en el servidor"""
+
+    if len(centros_educativos) == 0:
+        if provincia != 'Todas':
+            st.warning(f"No se encontraron Centros Educativos para la provincia: {provincia}")
+        return
+
+    titulos = list(COLUMNAS_TABLA.values())
+    columnas = list(COLUMNAS_TABLA.keys())
+
+    # Controles de orden y filtro
+    col_orden, col_direccion, col_filtro, col_texto = st.columns([2, 1, 2, 3])
+    with col_orden:
+        titulo_orden = st.selectbox("Ordenar por:", titulos, index=1, key="tabla_orden_columna")
+    with col_direccion:
+        direccion_orden = st.radio("Orden:", ["Ascendente", "Descendente"], key="tabla_orden_direccion")
+    with col_filtro:
+        titulo_filtro = st.selectbox("Filtrar columna:", titulos, index=1, key="tabla_filtro_columna")
+    with col_texto:
+        texto_filtro = st.text_input("Texto a buscar:", key="tabla_filtro_texto")
+
+    clave_orden = (
+        provincia, tipo_institucion,
+        columnas[titulos.index(titulo_orden)],
+        direccion_orden == "Ascendente",
+        columnas[titulos.index(titulo_filtro)],
+        texto_filtro.strip().lower()
+    )
+    orden = calcular_orden_tabla(centros_gdf, centros_educativos, *clave_orden)
+
+    # Volver a la primera página cuando cambia el orden o el filtro
+    if st.session_state.get('tabla_clave_orden') != clave_orden:
+        st.session_state.tabla_clave_orden = clave_orden
+        st.session_state.tabla_pagina = 1
+
+    if len(orden) == 0:
+        st.info("No se encontraron Centros Educativos que coincidan con el filtro")
+        return
+
+    # Controles de paginación
+    col_tamano, col_pagina = st.columns([1, 1])
+    with col_tamano:
+        tamano_pagina = st.selectbox("Filas por página:", TAMANOS_PAGINA_TABLA, key="tabla_tamano_pagina")
+    total_paginas = (len(orden) - 1) // tamano_pagina + 1
+    if st.session_state.get('tabla_pagina', 1) > total_paginas:
+        st.session_state.tabla_pagina = 1
+    with col_pagina:
+        pagina = st.number_input("Página:", min_value=1, max_value=total_paginas, step=1, key="tabla_pagina")
+
+    # Enviar al navegador únicamente las filas de la página visible
+    inicio = (pagina - 1) * tamano_pagina
+    posiciones_pagina = orden[inicio:inicio + tamano_pagina]
+    tabla_centros = centros_gdf.iloc[posiciones_pagina][columnas]
+
+    st.dataframe(
+        tabla_centros,
+        width='stretch',
+        hide_index=True,
+        column_config={columna: st.column_config.TextColumn(titulo) for columna, titulo in COLUMNAS_TABLA.items()}
+    )
+    st.caption(f"Mostrando {inicio + 1}–{inicio + len(posiciones_pagina)} de {len(orden)} centros educativos (página {pagina} de {total_paginas})")
+
 def crear_grafico_densidad_centros(_cantones, tipo_institucion='Todos'):
     """Gráfico comparativo de densidad y total de centros educativos por cantón"""
 
@@ -265,21 +822,7 @@ def crear_grafico_densidad_poblacional(_cantones, tipo_institucion='Todos'):
     
     return grafico
 
-def crear_mapa(cantones_gdf, centros_educativos, tipo_institucion='Todos'):
-
-    # Convertir cantones a WGS84
-    cantones_wgs84 = cantones_gdf.to_crs(epsg=4326)
-    cantones_simple = simplificar_geometrias(cantones_wgs84, tolerancia=0.002)
-    
-    # Redondear valores para mejorar visualización (MANTENIENDO LAS CAPAS ORIGINALES)
-    cantones_simple = cantones_simple.copy()
-    cantones_simple['Densidad (centros/km²)'] = cantones_simple['DENSIDAD_CENTROS_EDUCATIVOS_KM2'].round(4)
-    cantones_simple['Centros por 10k hab'] = cantones_simple['CENTROS_EDUCATIVOS_10K_HABITANTES'].round(2)
-    cantones_simple['Área (km²)'] = cantones_simple['AREA_KM2'].round(2)
-    cantones_simple['Densidad Poblacional (hab/km²)'] = cantones_simple['DENSIDAD_POBLACIONAL_KM2'].round(2)
-    cantones_simple['Total Centros'] = cantones_simple['TOTAL_CENTROS_EDUCATIVOS'].fillna(0).astype(int)
-    cantones_simple['Centros Públicos'] = cantones_simple['TOTAL_CENTROS_EDUCATIVOS_PUBLICOS'].fillna(0).astype(int)
-    cantones_simple['Centros Privados'] = cantones_simple['TOTAL_CENTROS_EDUCATIVOS_PRIVADO'].fillna(0).astype(int)
+def crear_mapa(cantones_gdf, centros_educativos, teselas, tipo_institucion='Todos'):
     
     # Crear mapa base
     m = folium.Map(
@@ -289,54 +832,22 @@ def crear_mapa(cantones_gdf, centros_educativos, tipo_institucion='Todos'):
         tiles='OpenStreetMap'
     )
     
-    # Capa 1: Densidad de centros educativos por cantón (MANTENIENDO LA ORIGINAL)
-    cantones_simple.explore(
-        m=m,
-        column='Densidad (centros/km²)',
-        cmap='YlOrRd',
-        legend=True,
-        legend_kwds={'caption': 'Densidad de centros educativos (centros/km²)'},
-        tooltip=['CANTÓN', 'PROVINCIA', 'Total Centros', 'Centros Públicos', 
-                 'Centros Privados', 'Densidad (centros/km²)'],
-        popup=['CANTÓN', 'PROVINCIA', 'Total Centros', 'Centros Públicos', 
-               'Centros Privados', 'Densidad (centros/km²)'],
-        style_kwds={
-            'fillOpacity': 0.85,
-            'weight': 1,
-            'color': 'gray'
-        },
-        highlight_kwds={
-            'fillOpacity': 0.85,
-            'weight': 3,
-            'color': 'black'
-        },
-        name='Densidad de centros educativos por cantón',
-        show=False
+    # Capa 1: Densidad de centros educativos por cantón
+    agregar_capa_coropletas(
+        m, teselas, cantones_gdf,
+        'DENSIDAD_CENTROS_EDUCATIVOS_KM2', 'Densidad (centros/km²)',
+        cm.linear.YlOrRd_09,
+        'Densidad de centros educativos (centros/km²)',
+        'Densidad de centros educativos por cantón'
     )
     
-    # Capa 2: Centros Educativos por cada 10000 habitantes (MANTENIENDO LA ORIGINAL)
-    cantones_simple.explore(
-        m=m,
-        column='Centros por 10k hab',
-        cmap='YlGnBu',
-        legend=True,
-        legend_kwds={'caption': 'Centros educativos por 10,000 habitantes'},
-        tooltip=['CANTÓN', 'PROVINCIA', 'Total Centros', 'Centros Públicos', 
-                 'Centros Privados', 'Centros por 10k hab'],
-        popup=['CANTÓN', 'PROVINCIA', 'Total Centros', 'Centros Públicos', 
-               'Centros Privados', 'Centros por 10k hab'],
-        style_kwds={
-            'fillOpacity': 0.85, 
-            'weight': 1,
-            'color': 'gray'
-        },
-        highlight_kwds={
-            'fillOpacity': 0.85,
-            'weight': 3,
-            'color': 'black'
-        },
-        name='Centros educativos por cada 10k habitantes',
-        show=False
+    # Capa 2: Centros Educativos por cada 10000 habitantes
+    agregar_capa_coropletas(
+        m, teselas, cantones_gdf,
+        'CENTROS_EDUCATIVOS_10K_HABITANTES', 'Centros por 10k hab',
+        cm.linear.YlGnBu_09,
+        'Centros educativos por 10,000 habitantes',
+        'Centros educativos por cada 10k habitantes'
     )
     
     # MODIFICACIÓN: Filtrar centros educativos según el tipo de institución seleccionado
@@ -468,7 +979,8 @@ def crear_mapa_busqueda(centro_mapa, zoom, ubicacion_coords, centros_cercanos, c
     
     # Centro seleccionado
     if centro_coords and centro_seleccionado != 'Seleccione':
-        centro_data = centros_gdf[centros_gdf['CENTRO_EDU'] == centro_seleccionado].iloc[0]
+        _, posiciones_nombres = construir_indice_nombres(centros_gdf)
+        centro_data = centros_gdf.iloc[posiciones_nombres[centro_seleccionado]]
         
         popup_html = f"""
         <b>{centro_data['CENTRO_EDU']}</b><br>
@@ -493,16 +1005,369 @@ def crear_mapa_busqueda(centro_mapa, zoom, ubicacion_coords, centros_cercanos, c
     
     return m
 
+# ============================================================================
+# Funciones para la exportación de datos
+# ============================================================================
+
+class SalidaEnBloques(io.RawIOBase):
+    """
+        Destino de escritura que acumula únicamente los bytes pendientes de entregar.
+        Conserva la posición total escrita para que el escritor de Parquet calcule
+        correctamente los desplazamientos del archivo.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bloques = []
+        self.posicion = 0
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self.bloques.append(bytes(datos))
+        self.posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self.posicion
+
+    def vaciar(self):
+        """Devolver y descartar los bytes acumulados desde la última llamada"""
+        datos = b''.join(self.bloques)
+        self.bloques.clear()
+        return datos
+
+def serializar_valor_json(valor):
+    """Convertir valores de numpy a tipos nativos para la serialización JSON"""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return str(valor)
+
+def obtener_version_datos():
+    """Identificador de la versión de los archivos de datos a partir de su fecha de modificación"""
+    archivos = [RUTA_CANTONES, RUTA_CENTROS_EDUCATIVOS, RUTA_POBLACION_VIVIENDA]
+    return '|'.join(str(os.path.getmtime(archivo)) for archivo in archivos if os.path.exists(archivo))
+
+def url_estatica(ruta_relativa):
+    """URL pública de un archivo ubicado en el directorio estático de la aplicación"""
+    base = st.get_option('server.baseUrlPath').strip('/')
+    prefijo = f"/{base}" if base else ''
+    return f"{prefijo}/app/static/{ruta_relativa}"
+
+def generar_bloques(gdf, columnas):
+    """Recorrer el GeoDataFrame en bloques de tamaño fijo con las columnas indicadas"""
+    columnas_disponibles = [columna for columna in columnas if columna in gdf.columns] + [gdf.geometry.name]
+    for inicio in range(0, len(gdf), TAMANO_BLOQUE_EXPORTACION):
+        yield gdf.iloc[inicio:inicio + TAMANO_BLOQUE_EXPORTACION][columnas_disponibles]
+
+def exportar_csv(gdf, columnas):
+    """Generar el contenido CSV por bloques"""
+    for numero, bloque in enumerate(generar_bloques(gdf, columnas)):
+        bloque = pd.DataFrame(bloque.drop(columns=bloque.geometry.name))
+        yield bloque.to_csv(index=False, header=(numero == 0)).encode('utf-8')
+
+def exportar_geojson(gdf, columnas):
+    """Generar el contenido GeoJSON delimitado por líneas (una entidad por línea) por bloques"""
+    for bloque in generar_bloques(gdf, columnas):
+        if bloque.crs is not None and bloque.crs.to_epsg() != 4326:
+            bloque = bloque.to_crs(epsg=4326)
+        lineas = [
+            json.dumps(entidad, ensure_ascii=False, default=serializar_valor_json)
+            for entidad in bloque.iterfeatures(na='null', drop_id=True)
+        ]
+        yield ('\n'.join(lineas) + '\n').encode('utf-8')
+
+def crear_tabla_geoparquet(bloque):
+    """Convertir un bloque del GeoDataFrame en una tabla Arrow con metadatos GeoParquet"""
+    columna_geometria = bloque.geometry.name
+    tabla = pa.Table.from_pandas(pd.DataFrame(bloque.drop(columns=columna_geometria)), preserve_index=False)
+
+    # Las columnas vacías en el bloque se declaran como texto para mantener un esquema estable
+    campos = [pa.field(campo.name, pa.string()) if pa.types.is_null(campo.type) else campo for campo in tabla.schema]
+    tabla = tabla.cast(pa.schema(campos))
+    tabla = tabla.append_column(columna_geometria, pa.array(bloque.geometry.to_wkb(), type=pa.binary()))
+
+    metadatos_geo = {
+        'version': '1.0.0',
+        'primary_column': columna_geometria,
+        'columns': {
+            columna_geometria: {
+                'encoding': 'WKB',
+                'geometry_types': [],
+                'crs': bloque.crs.to_json_dict() if bloque.crs is not None else None
+            }
+        }
+    }
+    return tabla.replace_schema_metadata({'geo': json.dumps(metadatos_geo)})
+
+def exportar_geoparquet(gdf, columnas):
+    """Generar el contenido GeoParquet escribiendo un grupo de filas por bloque"""
+    salida = SalidaEnBloques()
+    escritor = None
+
+    for bloque in generar_bloques(gdf, columnas):
+        tabla = crear_tabla_geoparquet(bloque)
+        if escritor is None:
+            escritor = pq.ParquetWriter(salida, tabla.schema)
+        escritor.write_table(tabla.cast(escritor.schema))
+        yield salida.vaciar()
+
+    if escritor is not None:
+        escritor.close()
+        yield salida.vaciar()
+
+GENERADORES_EXPORTACION = {
+    'csv': exportar_csv,
+    'geojsonl': exportar_geojson,
+    'parquet': exportar_geoparquet
+}
+
+def escribir_exportacion(generador, ruta):
+    """Escribir en disco los bloques de una exportación sin mantener el archivo completo en memoria"""
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    ruta_temporal = None
+
+    try:
+        # Escribir en un archivo temporal para que las sesiones concurrentes nunca lean un archivo incompleto
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(ruta), suffix='.tmp', delete=False) as archivo:
+            ruta_temporal = archivo.name
+            bytes_escritos = 0
+            for bloque in generador:
+                bytes_escritos += len(bloque)
+                if bytes_escritos > MAXIMO_BYTES_ARCHIVO_ESTATICO:
+                    raise ValueError(
+                        f"el archivo supera el tamaño máximo de {MAXIMO_BYTES_ARCHIVO_ESTATICO // (1024 * 1024)} MB "
+                        "que se puede descargar. Aplique más filtros o elija otro formato"
+                    )
+                archivo.write(bloque)
+        os.replace(ruta_temporal, ruta)
+        ruta_temporal = None
+    finally:
+        generador.close()
+        if ruta_temporal is not None:
+            eliminar_archivo(ruta_temporal)
+
+def eliminar_archivo(ruta):
+    """Eliminar un archivo que otra sesión pudo haber eliminado antes"""
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+def limpiar_exportaciones(version, ruta_conservada=None):
+    """
+        Eliminar las exportaciones de versiones anteriores de los datos y, si el total supera
+        MAXIMO_BYTES_EXPORTACIONES, las usadas hace más tiempo.
+    """
+    if not os.path.isdir(DIRECTORIO_EXPORTACIONES):
+        return
+
+    for entrada in os.listdir(DIRECTORIO_EXPORTACIONES):
+        if entrada != version:
+            ruta = os.path.join(DIRECTORIO_EXPORTACIONES, entrada)
+            if os.path.isdir(ruta):
+                shutil.rmtree(ruta, ignore_errors=True)
+            else:
+                eliminar_archivo(ruta)
+
+    directorio = os.path.join(DIRECTORIO_EXPORTACIONES, version)
+    if not os.path.isdir(directorio):
+        return
+
+    # La fecha de modificación se actualiza cada vez que se muestra el enlace de descarga
+    archivos = []
+    for nombre in os.listdir(directorio):
+        ruta = os.path.join(directorio, nombre)
+        if not nombre.endswith('.tmp') and os.path.isfile(ruta):
+            estado_archivo = os.stat(ruta)
+            archivos.append((estado_archivo.st_mtime, estado_archivo.st_size, ruta))
+
+    bytes_totales = sum(tamano for _, tamano, _ in archivos)
+    for _, tamano, ruta in sorted(archivos):
+        if bytes_totales <= MAXIMO_BYTES_EXPORTACIONES:
+            break
+        if ruta != ruta_conservada:
+            eliminar_archivo(ruta)
+            bytes_totales -= tamano
+
+def mostrar_exportacion(gdf, columnas, clave, prefijo, clave_widget):
+    """Controles para generar y descargar una exportación de los datos filtrados"""
+
+    formato = st.selectbox("Formato:", list(FORMATOS_EXPORTACION), key=f"{clave_widget}_formato")
+    extension = FORMATOS_EXPORTACION[formato]
+
+    # El nombre del archivo depende del estado de los filtros y de las columnas, por lo que se reutiliza entre sesiones
+    version = hashlib.sha1(obtener_version_datos().encode('utf-8')).hexdigest()[:12]
+    identificador = hashlib.sha1(f"{clave}|{','.join(columnas)}".encode('utf-8')).hexdigest()[:16]
+    nombre_archivo = f"{prefijo}_{identificador}.{extension}"
+    ruta = os.path.join(DIRECTORIO_EXPORTACIONES, version, nombre_archivo)
+
+    if not os.path.exists(ruta):
+        if st.button("Generar archivo", key=f"{clave_widget}_btn"):
+            try:
+                with st.spinner("Generando archivo..."):
+                    escribir_exportacion(GENERADORES_EXPORTACION[extension](gdf, columnas), ruta)
+                limpiar_exportaciones(version, ruta)
+            except Exception as e:
+                st.error(f"Ha ocurrido un error al generar la exportación: {e}")
+
+    # Streamlit envía los archivos estáticos por partes desde el disco
+    try:
+        os.utime(ruta)
+        disponible = True
+    except FileNotFoundError:
+        disponible = False
+
+    if disponible:
+        url = url_estatica(f"exportaciones/{version}/{nombre_archivo}")
+        st.markdown(
+            f'<a href="{url}" download="{prefijo}.{extension}">⬇️ Descargar {formato}</a>',
+            unsafe_allow_html=True
+        )
+
+# ============================================================================
+# Estado de búsqueda por sesión
+# ============================================================================
+
+class AlmacenBusquedas:
+    """
+        Estado de búsqueda de cada sesión, compartido por el servidor.
+        Cuando el total supera el presupuesto de memoria se descarta el estado
+        de las sesiones usadas hace más tiempo (LRU).
+    """
+
+    def __init__(self, presupuesto_bytes):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.sesiones = OrderedDict()
+        self.bytes_totales = 0
+        self.candado = threading.Lock()
+
+    def obtener(self, id_sesion):
+        """Devolver el estado de la sesión y marcarla como la más reciente"""
+        with self.candado:
+            if id_sesion not in self.sesiones:
+                return None
+            self.sesiones.move_to_end(id_sesion)
+            return self.sesiones[id_sesion][0]
+
+    def guardar(self, id_sesion, estado):
+        """Guardar el estado de la sesión y desalojar las sesiones menos recientes si es necesario"""
+        bytes_estado = calcular_bytes(estado)
+        with self.candado:
+            if id_sesion in self.sesiones:
+                self.bytes_totales -= self.sesiones.pop(id_sesion)[1]
+            self.sesiones[id_sesion] = (estado, bytes_estado)
+            self.bytes_totales += bytes_estado
+
+            while self.bytes_totales > self.presupuesto_bytes and len(self.sesiones) > 1:
+                _, (_, bytes_desalojados) = self.sesiones.popitem(last=False)
+                self.bytes_totales -= bytes_desalojados
+
+    def descartar_inactivas(self, es_activa):
+        """Eliminar el estado de las sesiones que ya no están conectadas"""
+        with self.candado:
+            for id_sesion in [id_sesion for id_sesion in self.sesiones if not es_activa(id_sesion)]:
+                self.bytes_totales -= self.sesiones.pop(id_sesion)[1]
+
+    def diagnostico(self):
+        """Cantidad de bytes utilizados por cada sesión activa, de la más a la menos reciente"""
+        with self.candado:
+            return [(id_sesion, bytes_estado) for id_sesion, (_, bytes_estado) in reversed(self.sesiones.items())]
+
+def calcular_bytes(valor):
+    """Estimar los bytes ocupados por un valor del estado de búsqueda"""
+    if isinstance(valor, np.ndarray):
+        return sys.getsizeof(valor) + (0 if valor.base is None else valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(calcular_bytes(k) + calcular_bytes(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(calcular_bytes(v) for v in valor)
+    return sys.getsizeof(valor)
+
+@st.cache_resource
+def obtener_almacen_busquedas():
+    """Almacén único del estado de búsqueda para todas las sesiones"""
+    return AlmacenBusquedas(PRESUPUESTO_BYTES_BUSQUEDA)
+
+def obtener_id_sesion():
+    """Identificador de la sesión de Streamlit actual"""
+    contexto = get_script_run_ctx()
+    return contexto.session_id if contexto is not None else 'local'
+
+def sesion_activa(id_sesion):
+    """Indicar si el runtime de Streamlit mantiene conectada la sesión (siempre en modo local)"""
+    if not runtime.exists():
+        return True
+    return runtime.get_instance().is_active_session(id_sesion)
+
+def obtener_estado_busqueda():
+    """Estado de búsqueda de la sesión actual, o uno nuevo si no existe o fue desalojado"""
+    estado = obtener_almacen_busquedas().obtener(obtener_id_sesion())
+    if estado is None:
+        estado = {
+            'sugerencias': [],
+            'direccion_seleccionada': None,
+            'ubicacion_coords': None,
+            'indices_cercanos': None,
+            'distancias_cercanos': None,
+            'centro_coords': None,
+            'centro_seleccionado': 'Seleccione',
+            'centro_posicion': None,
+            'tipo_activo': None
+        }
+    return estado
+
+def guardar_estado_busqueda(estado):
+    """Registrar el estado de búsqueda de la sesión actual en el almacén compartido"""
+    almacen = obtener_almacen_busquedas()
+    almacen.descartar_inactivas(sesion_activa)
+    almacen.guardar(obtener_id_sesion(), estado)
+
+def buscar_centros_cercanos(centros_gdf, lat, lon, radio_km=1.0):
+    """
+        Posiciones de los centros educativos a menos de radio_km del punto, ordenadas por distancia.
+        Devuelve las posiciones de fila en el conjunto de datos compartido y sus distancias.
+    """
+    latitudes = centros_gdf['LATITUD'].to_numpy()
+    longitudes = centros_gdf['LONGITUD'].to_numpy()
+
+    # Prefiltrar por un recuadro de 0.01° (aproximadamente 1 km) alrededor del punto
+    radio = 0.01 * radio_km
+    candidatos = np.flatnonzero(
+        (np.abs(latitudes - lat) <= radio) & (np.abs(longitudes - lon) <= radio)
+    )
+
+    distancias = np.array(
+        [calcular_distancia(lat, lon, latitudes[i], longitudes[i]) for i in candidatos],
+        dtype=np.float32
+    )
+    dentro = distancias <= radio_km
+    orden = np.argsort(distancias[dentro], kind='stable')
+    return candidatos[dentro][orden].astype(np.int32), distancias[dentro][orden]
+
+def obtener_centros_cercanos(centros_gdf, estado):
+    """Reconstruir las filas de los centros cercanos a partir de las posiciones guardadas en el estado"""
+    if estado['indices_cercanos'] is None:
+        return None
+    centros_cercanos = centros_gdf.iloc[estado['indices_cercanos']]
+    return centros_cercanos.assign(DISTANCIA_KM=estado['distancias_cercanos'].astype(float))
+
 # ============================================================================
 # Fragmentos de la aplicación: Tabla, gráficos y mapas
 # ============================================================================
 
 @st.fragment
-def fragmento_tabla(centros_educativos_filtrados, provincia_seleccionada):
+def fragmento_tabla(centros_gdf, centros_educativos_filtrados, provincia_seleccionada, tipo_institucion):
     """Fragmento para la tabla."""
     
     st.subheader("Registro de Centros Educativos de Costa Rica")
-    crear_tabla(centros_educativos_filtrados, provincia_seleccionada)
+
+    # La tabla paginada solo envía al navegador las filas visibles
+    if st.toggle("Paginación en el servidor", value=True, key="tabla_paginada"):
+        crear_tabla_paginada(centros_gdf, centros_educativos_filtrados, provincia_seleccionada, tipo_institucion)
+    else:
+        crear_tabla(centros_educativos_filtrados, provincia_seleccionada)
 
 @st.fragment
 def fragmento_graficos(cantones_filtrados, tipo_institucion):
@@ -532,7 +1397,7 @@ def fragmento_graficos(cantones_filtrados, tipo_institucion):
             st.warning("No hay suficientes datos para generar el gráfico")
 
 @st.fragment
-def fragmento_mapa(cantones_filtrados, centros_educativos_filtrados, tipo_institucion):
+def fragmento_mapa(cantones_filtrados, centros_educativos_filtrados, teselas, tipo_institucion):
     """Fragmento para el mapa"""
     
     st.subheader("Distribución y densidad de Centros Educativos por cantón")
@@ -541,6 +1406,7 @@ def fragmento_mapa(cantones_filtrados, centros_educativos_filtrados, tipo_instit
         mapa = crear_mapa(
             cantones_filtrados, 
             centros_educativos_filtrados, 
+            teselas,
             tipo_institucion
         )
         st_folium(mapa, width='stretch', height=650, returned_objects=[])
@@ -548,26 +1414,13 @@ def fragmento_mapa(cantones_filtrados, centros_educativos_filtrados, tipo_instit
         st.warning("No hay datos de cantones para mostrar")
 
 @st.fragment
-def fragmento_busqueda(centros_gdf):
+def fragmento_busqueda(centros_gdf, vecinos):
     """Fragmento de búsqueda de centros educativos"""
 
     st.subheader("Búsqueda de Centros Educativos")
     
-    # Inicializar variables de sesión
-    if 'busqueda_sugerencias' not in st.session_state:
-        st.session_state.busqueda_sugerencias = []
-    if 'busqueda_direccion_seleccionada' not in st.session_state:
-        st.session_state.busqueda_direccion_seleccionada = None
-    if 'busqueda_ubicacion_coordenadas' not in st.session_state:
-        st.session_state.busqueda_ubicacion_coordenadas = None
-    if 'busqueda_centros_cercanos' not in st.session_state:
-        st.session_state.busqueda_centros_cercanos = None
-    if 'busqueda_centro_coordenadas' not in st.session_state:
-        st.session_state.busqueda_centro_coordenadas = None
-    if 'busqueda_centro_seleccionado' not in st.session_state:
-        st.session_state.busqueda_centro_seleccionado = 'Seleccione'
-    if 'busqueda_tipo_activo' not in st.session_state:
-        st.session_state.busqueda_tipo_activo = None
+    # Estado de búsqueda de la sesión
+    estado = obtener_estado_busqueda()
     
     # Pestaña para los dos tipos de búsqueda
     pestana_ubicacion, pestana_centro = st.tabs(["Búsqueda por ubicación", "Búsqueda por nombre"])
@@ -593,7 +1446,7 @@ def fragmento_busqueda(centros_gdf):
                 # Procesar la respuesta
                 if respuesta.status_code == 200:
                     resultado = respuesta.json()
-                    st.session_state.busqueda_sugerencias = [
+                    estado['sugerencias'] = [
                         {'display': r['display_name'], 'lat': float(r['lat']), 'lon': float(r['lon'])}
                         for r in resultado
                     ]
@@ -601,60 +1454,50 @@ def fragmento_busqueda(centros_gdf):
                 pass
         
         # Mostrar sugerencias de ubicaciones
-        if st.session_state.busqueda_sugerencias:
-            opciones = ['Seleccione'] + [s['display'] for s in st.session_state.busqueda_sugerencias]
+        if estado['sugerencias']:
+            opciones = ['Seleccione'] + [s['display'] for s in estado['sugerencias']]
             seleccion = st.selectbox("Sugerencias:", opciones, key="busqueda_select_sug")
             
             # Seleccionar la dirección seleccionada
             if seleccion != 'Seleccione':
-                st.session_state.busqueda_direccion_seleccionada = next(
-                    (s for s in st.session_state.busqueda_sugerencias if s['display'] == seleccion), None
+                estado['direccion_seleccionada'] = next(
+                    (s for s in estado['sugerencias'] if s['display'] == seleccion), None
                 )
         
         btn_buscar = st.button("Buscar", key="busqueda_btn")
         
         # Procesar búsqueda por ubicación
-        if btn_buscar and st.session_state.busqueda_direccion_seleccionada:
-            st.session_state.busqueda_centro_coords = None
-            st.session_state.busqueda_centro_seleccionado = 'Seleccione'
-            st.session_state.busqueda_tipo_activo = 'ubicacion'
+        if btn_buscar and estado['direccion_seleccionada']:
+            estado['centro_coords'] = None
+            estado['centro_seleccionado'] = 'Seleccione'
+            estado['centro_posicion'] = None
+            estado['tipo_activo'] = 'ubicacion'
             
-            lat = st.session_state.busqueda_direccion_seleccionada['lat']
-            lon = st.session_state.busqueda_direccion_seleccionada['lon']
-            st.session_state.busqueda_ubicacion_coords = (lat, lon)
-
-            # Radio de búsqueda de 1 km
-            radio = 0.01
-
-            # Filtrar centros educativos cercanos
-            centros_educativos_cercanos = centros_gdf[
-                (centros_gdf['LATITUD'].between(lat - radio, lat + radio)) &
-                (centros_gdf['LONGITUD'].between(lon - radio, lon + radio))
-            ].copy()
-            
-            centros_educativos_cercanos['DISTANCIA_KM'] = centros_educativos_cercanos.apply(
-                lambda r: calcular_distancia(lat, lon, r['LATITUD'], r['LONGITUD']), axis=1
-            )
-            centros_educativos_cercanos = centros_educativos_cercanos[centros_educativos_cercanos['DISTANCIA_KM'] <= 1.0].sort_values('DISTANCIA_KM')
-            st.session_state.busqueda_centros_cercanos = centros_educativos_cercanos
-            st.success(f"Se identificaron {len(centros_educativos_cercanos)} centros educativos en un radio de 1km")
+            lat = estado['direccion_seleccionada']['lat']
+            lon = estado['direccion_seleccionada']['lon']
+            estado['ubicacion_coords'] = (lat, lon)
+
+            # Filtrar centros educativos cercanos en un radio de 1 km
+            estado['indices_cercanos'], estado['distancias_cercanos'] = buscar_centros_cercanos(centros_gdf, lat, lon)
+            st.success(f"Se identificaron {len(estado['indices_cercanos'])} centros educativos en un radio de 1km")
         
         # Mostrar mapa de resultados
-        if st.session_state.busqueda_tipo_activo == 'ubicacion' and st.session_state.busqueda_ubicacion_coords:
+        if estado['tipo_activo'] == 'ubicacion' and estado['ubicacion_coords']:
             st.markdown("---")
             
+            centros_educativos_cercanos = obtener_centros_cercanos(centros_gdf, estado)
             mapa = crear_mapa_busqueda(
-                st.session_state.busqueda_ubicacion_coords, 14,
-                st.session_state.busqueda_ubicacion_coords,
-                st.session_state.busqueda_centros_cercanos,
+                estado['ubicacion_coords'], 14,
+                estado['ubicacion_coords'],
+                centros_educativos_cercanos,
                 None, 'Seleccione', centros_gdf
             )
             st_folium(mapa, width='stretch', height=500, returned_objects=[])
             
             # Tabla de resultados
-            if st.session_state.busqueda_centros_cercanos is not None and len(st.session_state.busqueda_centros_cercanos) > 0:
+            if centros_educativos_cercanos is not None and len(centros_educativos_cercanos) > 0:
                 st.dataframe(
-                    st.session_state.busqueda_centros_cercanos[
+                    centros_educativos_cercanos[
                         ['CENTRO_EDU', 'TIPO_INSTI', 'CANTON', 'DISTRITO', 'DISTANCIA_KM']
                     ],
                     width='stretch',
@@ -667,10 +1510,20 @@ def fragmento_busqueda(centros_gdf):
                         'DISTANCIA_KM': st.column_config.NumberColumn("Distancia (km)", format="%.2f")
                     }
                 )
+
+                # Exportación de los resultados de la búsqueda
+                lat, lon = estado['ubicacion_coords']
+                mostrar_exportacion(
+                    centros_educativos_cercanos,
+                    COLUMNAS_EXPORTACION_CENTROS + ['DISTANCIA_KM'],
+                    f"busqueda|{lat}|{lon}",
+                    'busqueda_centros_educativos',
+                    'busqueda_exportacion'
+                )
     
     with pestana_centro:
         
-        centros_lista = centros_gdf.sort_values('CENTRO_EDU')['CENTRO_EDU'].unique().tolist()
+        centros_lista, posiciones_nombres = construir_indice_nombres(centros_gdf)
 
         # Seleccionar el centro educativo a partir de una lista desplegable
         centro_seleccionado = st.selectbox(
@@ -682,50 +1535,114 @@ def fragmento_busqueda(centros_gdf):
         
         # Procesar búsqueda por centro
         if btn_busqueda_centro and centro_seleccionado != 'Seleccione':
-            st.session_state.busqueda_ubicacion_coords = None
-            st.session_state.busqueda_centros_cercanos = None
-            st.session_state.busqueda_tipo_activo = 'centro'
+            estado['ubicacion_coords'] = None
+            estado['indices_cercanos'] = None
+            estado['distancias_cercanos'] = None
+            estado['tipo_activo'] = 'centro'
             
-            centro_data = centros_gdf[centros_gdf['CENTRO_EDU'] == centro_seleccionado].iloc[0]
-            st.session_state.busqueda_centro_coords = (centro_data['LATITUD'], centro_data['LONGITUD'])
-            st.session_state.busqueda_centro_seleccionado = centro_seleccionado
+            posicion = posiciones_nombres[centro_seleccionado]
+            centro_data = centros_gdf.iloc[posicion]
+            estado['centro_coords'] = (centro_data['LATITUD'], centro_data['LONGITUD'])
+            estado['centro_seleccionado'] = centro_seleccionado
+            estado['centro_posicion'] = posicion
             st.success(f"Centro Educativo localizado: {centro_seleccionado}")
         
         # Mostrar mapa para búsqueda por centro
-        if st.session_state.busqueda_tipo_activo == 'centro' and st.session_state.busqueda_centro_coords:
+        if estado['tipo_activo'] == 'centro' and estado['centro_coords']:
             st.markdown("---")
+
+            # Alternativas más cercanas desde la tabla de vecinos precalculada
+            centros_alternativos = obtener_vecinos_cercanos(centros_gdf, vecinos, estado['centro_posicion'])
             
             mapa = crear_mapa_busqueda(
-                st.session_state.busqueda_centro_coords, 15,
-                None, None,
-                st.session_state.busqueda_centro_coords,
-                st.session_state.busqueda_centro_seleccionado,
+                estado['centro_coords'], 15,
+                None, centros_alternativos,
+                estado['centro_coords'],
+                estado['centro_seleccionado'],
                 centros_gdf
             )
+            if len(centros_alternativos) > 0:
+                latitudes = np.append(centros_alternativos['LATITUD'].to_numpy(), estado['centro_coords'][0])
+                longitudes = np.append(centros_alternativos['LONGITUD'].to_numpy(), estado['centro_coords'][1])
+                mapa.fit_bounds([[latitudes.min(), longitudes.min()], [latitudes.max(), longitudes.max()]])
             st_folium(mapa, width='stretch', height=500, returned_objects=[])
-            
+
+            # Tabla de centros educativos alternativos
+            if len(centros_alternativos) > 0:
+                st.markdown(f"**Centros educativos más cercanos a {estado['centro_seleccionado']}**")
+                st.dataframe(
+                    centros_alternativos[
+                        ['CENTRO_EDU', 'TIPO_INSTI', 'RELACION', 'CANTON', 'DISTRITO', 'DISTANCIA_KM']
+                    ],
+                    width='stretch',
+                    hide_index=True,
+                    column_config={
+                        'CENTRO_EDU': "Centro Educativo",
+                        'TIPO_INSTI': "Tipo",
+                        'RELACION': "Relación",
+                        'CANTON': "Cantón",
+                        'DISTRITO': "Distrito",
+                        'DISTANCIA_KM': st.column_config.NumberColumn("Distancia (km)", format="%.2f")
+                    }
+                )
+
+    guardar_estado_busqueda(estado)
+
+@st.fragment
+def fragmento_exportacion(centros_educativos_filtrados, cantones_filtrados, provincia_seleccionada, tipo_institucion):
+    """Fragmento para la exportación de los datos filtrados"""
+
+    st.subheader("Exportación de datos")
+    st.markdown(f"Filtros actuales: provincia **{provincia_seleccionada}**, tipo de institución **{tipo_institucion}**")
+
+    conjunto = st.radio(
+        "Datos a exportar:",
+        ["Centros educativos", "Métricas por cantón"],
+        horizontal=True,
+        key="exportacion_conjunto"
+    )
+
+    if conjunto == "Centros educativos":
+        if centros_educativos_filtrados.empty:
+            st.warning("No hay centros educativos para exportar con los filtros actuales")
+            return
+        mostrar_exportacion(
+            centros_educativos_filtrados,
+            COLUMNAS_EXPORTACION_CENTROS,
+            f"centros|{provincia_seleccionada}|{tipo_institucion}",
+            'centros_educativos',
+            'exportacion_centros'
+        )
+    else:
+        if cantones_filtrados.empty:
+            st.warning("No hay cantones para exportar con los filtros actuales")
+            return
+        mostrar_exportacion(
+            cantones_filtrados,
+            COLUMNAS_EXPORTACION_CANTONES,
+            f"cantones|{provincia_seleccionada}",
+            'metricas_cantones',
+            'exportacion_cantones'
+        )
+
 def main():
     st.title("Análisis de Centros Educativos de Costa Rica")
 
     # Cargar datos de la aplicación
-    cantones_gdf, centros_gdf = cargar_datos()
+    cantones_gdf, centros_gdf, tiempos_carga = cargar_datos()
 
     if cantones_gdf is None or centros_gdf is None:
         st.error("No se lograron cargar los datos")
         return
+
+    # Vecinos más cercanos de cada centro educativo y teselas de cantones, calculados una vez por conjunto de datos
+    vecinos = construir_vecinos_cercanos(centros_gdf)
+    teselas = generar_teselas_cantones(cantones_gdf)
     
     st.sidebar.title("Filtros de datos")
     
     # Filtros de datos
-    if 'PROVINCIA' in centros_gdf.columns:
-        centros_gdf['PROVINCIA'] = centros_gdf['PROVINCIA'].fillna('').astype(str)
-        lista_provincias = ['Todas'] + sorted([p for p in centros_gdf['PROVINCIA'].unique() if p.strip()])
-    else:
-        lista_provincias = ['Todas']
-    
-    # Filtros de cantones
-    if 'PROVINCIA' in cantones_gdf.columns:
-        cantones_gdf['PROVINCIA'] = cantones_gdf['PROVINCIA'].fillna('').astype(str)
+    lista_provincias = ['Todas'] + sorted([p for p in centros_gdf['PROVINCIA'].unique() if p.strip()])
     
     provincia_seleccionada = st.sidebar.selectbox("Provincia:", lista_provincias)
     tipo_institucion = st.sidebar.selectbox("Tipo de institución:", ['Todos', 'PÚBLICO', 'PRIVADO'])
@@ -765,26 +1682,46 @@ def main():
     st.sidebar.metric("Total de Centros Educativos", total)
     st.sidebar.metric("Centros Educativos Públicos", publicos)
     st.sidebar.metric("Centros Educativos Privados", privados)
-    
+
     # Pestañas principales de la aplicación
-    pestanas_tabla, pestanas_graficos, pestanas_mapa, pestanas_busqueda = st.tabs([
+    pestanas_tabla, pestanas_graficos, pestanas_mapa, pestanas_busqueda, pestanas_exportacion = st.tabs([
         "📊 Tabla",
         "📈 Gráfico",
         "🗺️ Mapa",
-        "🔍 Búsqueda"
+        "🔍 Búsqueda",
+        "📥 Exportación"
     ])
     
     with pestanas_tabla:
-        fragmento_tabla(centros_educativos_filtrados, provincia_seleccionada)
+        fragmento_tabla(centros_gdf, centros_educativos_filtrados, provincia_seleccionada, tipo_institucion)
     
     with pestanas_graficos:
         fragmento_graficos(cantones_filtrados, tipo_institucion)
     
     with pestanas_mapa:
-        fragmento_mapa(cantones_filtrados, centros_educativos_filtrados, tipo_institucion)
+        fragmento_mapa(cantones_filtrados, centros_educativos_filtrados, teselas, tipo_institucion)
     
     with pestanas_busqueda:
-        fragmento_busqueda(centros_gdf)
+        fragmento_busqueda(centros_gdf, vecinos)
+
+    with pestanas_exportacion:
+        fragmento_exportacion(centros_educativos_filtrados, cantones_filtrados, provincia_seleccionada, tipo_institucion)
+
+    # Diagnóstico de la carga de datos, después de las pestañas para reflejar el estado de esta ejecución
+    with st.sidebar.expander("Diagnóstico"):
+        st.markdown("**Tiempos de carga de los datos**")
+        for fuente, segundos in tiempos_carga.items():
+            st.caption(f"{fuente}: {segundos:.2f} s")
+
+        st.markdown("**Estado de búsqueda por sesión**")
+        almacen = obtener_almacen_busquedas()
+        almacen.descartar_inactivas(sesion_activa)
+        sesiones = almacen.diagnostico()
+        bytes_totales = sum(bytes_estado for _, bytes_estado in sesiones)
+        bytes_sesion_actual = dict(sesiones).get(obtener_id_sesion(), 0)
+        st.caption(f"Sesiones activas: {len(sesiones)}")
+        st.caption(f"Total: {bytes_totales / 1024:,.1f} KB de {PRESUPUESTO_BYTES_BUSQUEDA / 1024:,.0f} KB")
+        st.caption(f"Sesión actual: {bytes_sesion_actual / 1024:,.1f} KB")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file